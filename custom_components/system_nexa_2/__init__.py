@@ -5,7 +5,13 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform, CONF_HOST, CONF_TOKEN
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_BUFFER_COMMANDS,
+    CONF_HEDGE_READS,
+    DEFAULT_BUFFER_COMMANDS,
+    DEFAULT_HEDGE_READS,
+)
 from .api import SystemNexa2Client
 
 PLATFORMS: list[Platform] = [Platform.LIGHT]
@@ -15,7 +21,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     hass.data.setdefault(DOMAIN, {})
     
-    client = SystemNexa2Client(entry.data[CONF_HOST], entry.data[CONF_TOKEN])
+    client = SystemNexa2Client(
+        entry.data[CONF_HOST],
+        entry.data[CONF_TOKEN],
+        hedge_reads=entry.options.get(CONF_HEDGE_READS, DEFAULT_HEDGE_READS),
+        buffer_commands=entry.options.get(
+            CONF_BUFFER_COMMANDS, DEFAULT_BUFFER_COMMANDS
+        ),
+    )
     
     # Store the client in hass.data so platforms can access it
     hass.data[DOMAIN][entry.entry_id] = client
@@ -25,8 +38,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # For now we skip it to speed up startup.
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
@@ -2,13 +2,34 @@
 import logging
 import aiohttp
 import asyncio
+import time
+from collections import deque
+
+from .const import (
+    DEFAULT_TIMEOUT,
+    MIN_TIMEOUT,
+    MIN_WRITE_TIMEOUT,
+    TIMEOUT_MULTIPLIER,
+    RTT_SAMPLE_SIZE,
+    RTT_MIN_SAMPLES,
+    HEDGE_MIN_INTERVAL,
+    DEFAULT_INTENT_TTL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 class SystemNexa2Client:
     """Client for controlling System Nexa 2 devices."""
 
-    def __init__(self, host: str, token: str, port: int = 3000) -> None:
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        port: int = 3000,
+        hedge_reads: bool = False,
+        buffer_commands: bool = False,
+        intent_ttl: float = DEFAULT_INTENT_TTL,
+    ) -> None:
         """Initialize the client."""
         self._host = host
         self._port = port
@@ -19,17 +40,182 @@ class SystemNexa2Client:
         self._callback = None
         self._session: aiohttp.ClientSession | None = None
         self._listening = False
+        self._hedge_reads = hedge_reads
+        # Recent round-trip times (seconds) of HTTP requests to this device
+        self._rtt_samples: deque[float] = deque(maxlen=RTT_SAMPLE_SIZE)
+        self._last_hedge: float | None = None
+        # Latest command that failed while the device was unreachable.
+        # Only one is kept: a newer command always supersedes an older one.
+        self._buffer_commands = buffer_commands
+        self._intent_ttl = intent_ttl
+        self._intent: dict | None = None
+        # Bumped by every command so stale replays and failures can tell they were superseded
+        self._command_generation = 0
+        # Serializes commands and replays so a replay can never land after a newer command
+        self._command_lock = asyncio.Lock()
 
-    async def async_get_state(self) -> dict:
-        """Get the current state of the device."""
+    def _rtt_percentile(self, percentile: float) -> float | None:
+        """Return the given percentile of observed round-trip times, if known."""
+        if len(self._rtt_samples) < RTT_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._rtt_samples)
+        index = round(percentile / 100 * (len(ordered) - 1))
+        return ordered[index]
+
+    def _request_timeout(self, write: bool = False) -> float:
+        """Return the request timeout derived from observed latency."""
+        p99 = self._rtt_percentile(99)
+        if p99 is None:
+            return DEFAULT_TIMEOUT
+        floor = MIN_WRITE_TIMEOUT if write else MIN_TIMEOUT
+        return max(floor, min(DEFAULT_TIMEOUT, p99 * TIMEOUT_MULTIPLIER))
+
+    async def _async_request(
+        self, session: aiohttp.ClientSession, params: dict | None = None
+    ) -> dict:
+        """Send a GET /state request and record its round-trip time.
+
+        Requests with params change the device state and get the write timeout.
+        """
         url = f"{self._base_url}/state"
         headers = {"Content-type": "application/json", "token": self._token}
-        
+        timeout = self._request_timeout(write=params is not None)
+        start = time.monotonic()
+        try:
+            async with session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+        except asyncio.TimeoutError:
+            # Count the timeout as a slow sample so a sluggish device widens its own budget
+            self._rtt_samples.append(timeout)
+            raise
+        self._rtt_samples.append(time.monotonic() - start)
+        return data
+
+    async def _async_hedged_request(self, session: aiohttp.ClientSession) -> dict:
+        """Send a read, hedging with a second request if the first exceeds p95."""
+        delay = self._rtt_percentile(95)
+        if delay is None or (
+            # Hedge budget, so a flapping device does not get double traffic
+            self._last_hedge is not None
+            and time.monotonic() - self._last_hedge < HEDGE_MIN_INTERVAL
+        ):
+            return await self._async_request(session)
+
+        started: dict[asyncio.Future, float] = {}
+        pending: set[asyncio.Future] = set()
+        won = False
+        try:
+            first = asyncio.ensure_future(self._async_request(session))
+            started[first] = time.monotonic()
+            pending.add(first)
+            done, pending = await asyncio.wait(pending, timeout=delay)
+
+            if not done:
+                _LOGGER.debug("Hedging slow state request to System Nexa 2 device at %s", self._host)
+                self._last_hedge = time.monotonic()
+                second = asyncio.ensure_future(self._async_request(session))
+                started[second] = self._last_hedge
+                pending.add(second)
+
+            last_error: BaseException | None = None
+            while True:
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        won = True
+                        return task.result()
+                    last_error = error
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+            # Every request failed, surface the last error
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+                if won and task is first:
+                    # The first request outlived the winner, so this is a lower bound on its RTT
+                    self._rtt_samples.append(time.monotonic() - started[task])
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def _buffer_intent(
+        self, params: dict, expected: float | None, generation: int
+    ) -> None:
+        """Remember a failed command so it can be replayed on reconnect."""
+        if not self._buffer_commands or generation != self._command_generation:
+            return
+        _LOGGER.debug("Buffering command %s for offline System Nexa 2 device at %s", params, self._host)
+        self._intent = {
+            "params": params,
+            "expected": expected,
+            "generation": generation,
+            "expires": time.monotonic() + self._intent_ttl,
+        }
+
+    async def _async_replay_intent(self, session: aiohttp.ClientSession) -> float | None:
+        """Send the buffered command, if any, and return the resulting state."""
+        if self._intent is None:
+            return None
+
+        async with self._command_lock:
+            intent = self._intent
+            if intent is None:
+                return None
+            self._intent = None
+
+            if intent["generation"] != self._command_generation:
+                _LOGGER.debug("Buffered command for System Nexa 2 device at %s was superseded", self._host)
+                return None
+
+            if time.monotonic() > intent["expires"]:
+                _LOGGER.debug("Dropping expired buffered command for System Nexa 2 device at %s", self._host)
+                return None
+
+            try:
+                data = await self._async_request(session, intent["params"])
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as err:
+                _LOGGER.warning("Failed to replay buffered command to System Nexa 2 device at %s: %s", self._host, err)
+                # Keep it for the next attempt unless a newer command was issued meanwhile
+                if intent["generation"] == self._command_generation:
+                    self._intent = intent
+                return None
+            except aiohttp.ClientError as err:
+                _LOGGER.warning("System Nexa 2 device at %s rejected buffered command: %s", self._host, err)
+                return None
+
+        # A newer command queued behind the replay will be sent next, so don't report the old state
+        if intent["generation"] != self._command_generation:
+            _LOGGER.debug("Buffered command for System Nexa 2 device at %s was superseded during replay", self._host)
+            return None
+
+        _LOGGER.info("Replayed buffered command %s to System Nexa 2 device at %s", intent["params"], self._host)
+        if intent["expected"] is not None:
+            return intent["expected"]
+        if "state" in data:
+            return float(data["state"])
+        return None
+
+    async def async_get_state(self) -> dict:
+        """Get the current state of the device.
+
+        Reads are idempotent, so if hedging is enabled a second request is sent
+        when the first is slower than the device's observed p95 latency.
+        """
         async with aiohttp.ClientSession() as session:
             try:
-                async with session.get(url, headers=headers, timeout=10) as response:
-                    response.raise_for_status()
-                    return await response.json()
+                if self._hedge_reads:
+                    data = await self._async_hedged_request(session)
+                else:
+                    data = await self._async_request(session)
             except asyncio.TimeoutError:
                 _LOGGER.error("Timeout fetching state from System Nexa 2 device at %s", self._host)
                 raise
@@ -37,6 +223,12 @@ class SystemNexa2Client:
                 _LOGGER.error("Error fetching state from System Nexa 2 device: %s", err)
                 raise
 
+            # The device answered, so apply any command it missed while offline
+            state = await self._async_replay_intent(session)
+            if state is not None:
+                data = {**data, "state": state}
+            return data
+
     async def async_set_state(self, value: float) -> dict:
         """Set the state of the device.
         
@@ -48,23 +240,34 @@ class SystemNexa2Client:
         # Format to 2 decimal places as device rejects long floats
         val_str = "{:.2f}".format(value)
         
-        url = f"{self._base_url}/state"
         params = {"v": val_str}
-        headers = {"Content-type": "application/json", "token": self._token}
+        self._command_generation += 1
+        generation = self._command_generation
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession() as session, self._command_lock:
             try:
                 # The API docs show GET for setting state: GET /state?v={value}
-                async with session.get(url, params=params, headers=headers, timeout=10) as response:
-                    response.raise_for_status()
-                    return await response.json()
+                data = await self._async_request(session, params)
             except asyncio.TimeoutError:
                 _LOGGER.error("Timeout setting state for System Nexa 2 device at %s", self._host)
+                self._buffer_intent(params, float(val_str), generation)
+                raise
+            except aiohttp.ClientConnectionError as err:
+                _LOGGER.error("Error setting state for System Nexa 2 device: %s", err)
+                self._buffer_intent(params, float(val_str), generation)
                 raise
             except aiohttp.ClientError as err:
                 _LOGGER.error("Error setting state for System Nexa 2 device: %s", err)
+                # The device refused it, but it is still newer than anything buffered
+                if generation == self._command_generation:
+                    self._intent = None
                 raise
 
+        # A delivered command supersedes anything buffered before it
+        if generation == self._command_generation:
+            self._intent = None
+        return data
+
     async def async_set_power(self, state: bool) -> dict:
         """Turn the device on or off.
         
@@ -77,23 +280,35 @@ class SystemNexa2Client:
         # We always use HTTP for power toggle to ensure "restore" behavior works as per docs (?on=1)
         # WebSocket behavior for "value": "1" is implied to be full 100%, not restore.
         
-        # Fallback to HTTP
-        url = f"{self._base_url}/state"
-        headers = {"Content-type": "application/json", "token": self._token}
+        self._command_generation += 1
+        generation = self._command_generation
 
-        async with aiohttp.ClientSession() as session:
+        # Fallback to HTTP
+        async with aiohttp.ClientSession() as session, self._command_lock:
             try:
                 # GET /state?on=1
-                async with session.get(url, params=params, headers=headers, timeout=10) as response:
-                    response.raise_for_status()
-                    return await response.json()
+                data = await self._async_request(session, params)
             except asyncio.TimeoutError:
                 _LOGGER.error("Timeout setting power for System Nexa 2 device at %s", self._host)
+                # Restored brightness for "on" is only known from the device's response
+                self._buffer_intent(params, None if state else 0.0, generation)
+                raise
+            except aiohttp.ClientConnectionError as err:
+                _LOGGER.error("Error setting power for System Nexa 2 device: %s", err)
+                self._buffer_intent(params, None if state else 0.0, generation)
                 raise
             except aiohttp.ClientError as err:
                 _LOGGER.error("Error setting power for System Nexa 2 device: %s", err)
+                # The device refused it, but it is still newer than anything buffered
+                if generation == self._command_generation:
+                    self._intent = None
                 raise
 
+        # A delivered command supersedes anything buffered before it
+        if generation == self._command_generation:
+            self._intent = None
+        return data
+
     def set_callback(self, callback):
         """Set callback for state updates."""
         self._callback = callback
@@ -112,6 +327,11 @@ class SystemNexa2Client:
                     # Authenticate/Login (value empty as per docs if no elevated security, but required)
                     # Docs: {"type":"login", "value":""}
                     await ws.send_json({"type": "login", "value": self._token or ""})
+
+                    # Device is reachable again, apply any command it missed while offline
+                    state = await self._async_replay_intent(self._session)
+                    if state is not None and self._callback:
+                        self._callback(state)
                     
                     async for msg in ws:
                         if not self._listening:
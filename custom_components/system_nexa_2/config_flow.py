@@ -8,11 +8,19 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_TOKEN
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.components import zeroconf
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_BUFFER_COMMANDS,
+    CONF_HEDGE_READS,
+    DEFAULT_BUFFER_COMMANDS,
+    DEFAULT_HEDGE_READS,
+    DEFAULT_INTENT_TTL,
+)
 from .api import SystemNexa2Client
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,6 +35,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._discovered_devices = {}
         self._discovery_task = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -353,3 +369,31 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders=self.context.get("title_placeholders"),
             errors=errors
         )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle System Nexa 2 options."""
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_HEDGE_READS,
+                    default=self.config_entry.options.get(
+                        CONF_HEDGE_READS, DEFAULT_HEDGE_READS
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_BUFFER_COMMANDS,
+                    default=self.config_entry.options.get(
+                        CONF_BUFFER_COMMANDS, DEFAULT_BUFFER_COMMANDS
+                    ),
+                ): bool
+            }),
+            description_placeholders={"intent_ttl": str(DEFAULT_INTENT_TTL)},
+        )
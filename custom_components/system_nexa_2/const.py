@@ -2,3 +2,21 @@
 
 DOMAIN = "system_nexa_2"
 CONF_TOKEN = "token"
+CONF_BUFFER_COMMANDS = "buffer_commands"
+CONF_HEDGE_READS = "hedge_reads"
+
+# Adaptive request timeouts (seconds)
+DEFAULT_TIMEOUT = 10
+MIN_TIMEOUT = 1.0
+# Commands are not idempotent, so give them more headroom than fast reads would suggest
+MIN_WRITE_TIMEOUT = 3.0
+TIMEOUT_MULTIPLIER = 3
+RTT_SAMPLE_SIZE = 50
+RTT_MIN_SAMPLES = 5
+# At most one hedged read per device in this interval (seconds)
+HEDGE_MIN_INTERVAL = 60
+DEFAULT_HEDGE_READS = False
+
+# How long a command buffered for an offline device stays valid (seconds)
+DEFAULT_INTENT_TTL = 300
+DEFAULT_BUFFER_COMMANDS = False